@@ -3,13 +3,19 @@ from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from application.services import ConversionService, CurrencyService, RateService
+from application.services import (
+	ConversionService,
+	CurrencyService,
+	RateCoordinator,
+	RateService,
+)
 from config.settings import get_settings
 from infrastructure.cache.redis_cache import RedisCacheService
 from infrastructure.persistence.database import Database
+from infrastructure.persistence.rate_history_writer import RateHistoryWriter
 from infrastructure.persistence.repositories.currency import CurrencyRepository
 from infrastructure.providers import (
 	CurrencyAPIProvider,
@@ -25,9 +31,12 @@ class AppDependencies:
 	"""Container for application-wide singleton dependencies."""
 
 	db: Database | None = None
+	history_writer: RateHistoryWriter | None = None
+	redis_pool: BlockingConnectionPool | None = None
 	redis_client: Redis | None = None
 	redis_cache: RedisCacheService | None = None
 	providers: dict[str, ExchangeRateProvider] | None = None
+	rate_coordinator: RateCoordinator | None = None
 
 
 deps = AppDependencies()
@@ -38,23 +47,51 @@ def init_dependencies() -> None:
 	logger.info('Initializing dependencies...')
 	settings = get_settings()
 
-	deps.db = Database(settings.DATABASE_URL)
-	deps.redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+	deps.db = Database(
+		settings.DATABASE_URL,
+		pool_size=settings.DB_POOL_SIZE,
+		max_overflow=settings.DB_MAX_OVERFLOW,
+		pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+	)
+	deps.history_writer = RateHistoryWriter(deps.db)
+	# One bounded pool shared by every request; callers wait for a free connection
+	# instead of opening new sockets without limit under load.
+	deps.redis_pool = BlockingConnectionPool.from_url(
+		settings.REDIS_URL,
+		max_connections=settings.REDIS_MAX_CONNECTIONS,
+		timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+		decode_responses=True,
+	)
+	deps.redis_client = Redis(connection_pool=deps.redis_pool)
 	deps.redis_cache = RedisCacheService(deps.redis_client)
 
+	max_connections = settings.PROVIDER_MAX_CONNECTIONS
 	deps.providers = {
-		'fixerio': FixerIOProvider(settings.FIXERIO_API_KEY),
-		'openexchange': OpenExchangeProvider(settings.OPENEXCHANGE_APP_ID),
-		'currencyapi': CurrencyAPIProvider(settings.CURRENCYAPI_KEY),
+		'fixerio': FixerIOProvider(settings.FIXERIO_API_KEY, max_connections=max_connections),
+		'openexchange': OpenExchangeProvider(
+			settings.OPENEXCHANGE_APP_ID, max_connections=max_connections
+		),
+		'currencyapi': CurrencyAPIProvider(
+			settings.CURRENCYAPI_KEY, max_connections=max_connections
+		),
 	}
+	deps.rate_coordinator = RateCoordinator()
 	logger.info('Dependencies initialized')
 
 
 async def cleanup_dependencies() -> None:
 	logger.info('Cleaning up dependencies...')
 
+	# In-flight fetches and pending cache writes still need Redis and the history
+	# writer, which then flushes the rows they queued.
+	if deps.rate_coordinator:
+		await deps.rate_coordinator.drain()
+	if deps.history_writer:
+		await deps.history_writer.close()
 	if deps.redis_client:
-		await deps.redis_client.close()
+		await deps.redis_client.aclose()
+	if deps.redis_pool:
+		await deps.redis_pool.disconnect()
 	if deps.db:
 		await deps.db.close()
 	if deps.providers:
@@ -71,9 +108,17 @@ async def bootstrap() -> None:
 	if deps.db is None or deps.redis_cache is None or deps.providers is None:
 		raise RuntimeError('Dependencies not initialized. Call init_dependencies() first.')
 
+	await deps.db.warm_up()
+	if deps.history_writer is not None:
+		deps.history_writer.start()
+
 	async with deps.db.managed_session() as session:
 		repo = CurrencyRepository(db_session=session, cache_service=deps.redis_cache)
-		service = CurrencyService(repository=repo, providers=list(deps.providers.values()))
+		service = CurrencyService(
+			repository=repo,
+			providers=list(deps.providers.values()),
+			provider_timeout=get_settings().PROVIDER_TIMEOUT_SECONDS,
+		)
 		await service.initialize_supported_currencies()
 
 	logger.info('Bootstrap complete')
@@ -93,41 +138,65 @@ def get_redis_cache() -> RedisCacheService:
 	return deps.redis_cache
 
 
+def get_history_writer() -> RateHistoryWriter:
+	if deps.history_writer is None:
+		raise RuntimeError('Rate history writer not initialized')
+	return deps.history_writer
+
+
 def get_providers() -> dict[str, ExchangeRateProvider]:
 	if deps.providers is None:
 		raise RuntimeError('Providers not initialized')
 	return deps.providers
 
 
+def get_rate_coordinator() -> RateCoordinator:
+	if deps.rate_coordinator is None:
+		raise RuntimeError('Rate coordinator not initialized')
+	return deps.rate_coordinator
+
+
 async def get_currency_repository(
 	session: Annotated[AsyncSession, Depends(get_db_session)],
 	cache: Annotated[RedisCacheService, Depends(get_redis_cache)],
+	history_writer: Annotated[RateHistoryWriter, Depends(get_history_writer)],
 ) -> CurrencyRepository:
-	return CurrencyRepository(db_session=session, cache_service=cache)
+	return CurrencyRepository(
+		db_session=session, cache_service=cache, history_writer=history_writer
+	)
 
 
 async def get_currency_service(
 	repository: Annotated[CurrencyRepository, Depends(get_currency_repository)],
 	providers: Annotated[dict[str, ExchangeRateProvider], Depends(get_providers)],
 ) -> CurrencyService:
-	return CurrencyService(repository=repository, providers=list(providers.values()))
+	return CurrencyService(
+		repository=repository,
+		providers=list(providers.values()),
+		provider_timeout=get_settings().PROVIDER_TIMEOUT_SECONDS,
+	)
 
 
 async def get_rate_service(
 	currency_service: Annotated[CurrencyService, Depends(get_currency_service)],
 	repository: Annotated[CurrencyRepository, Depends(get_currency_repository)],
 	providers: Annotated[dict[str, ExchangeRateProvider], Depends(get_providers)],
+	coordinator: Annotated[RateCoordinator, Depends(get_rate_coordinator)],
 ) -> RateService:
+	settings = get_settings()
 	return RateService(
 		currency_service=currency_service,
 		repository=repository,
 		primary_provider=providers['fixerio'],
 		secondary_providers=[providers['openexchange'], providers['currencyapi']],
+		coordinator=coordinator,
+		compare_every=settings.RATE_COMPARE_EVERY,
+		provider_timeout=settings.PROVIDER_TIMEOUT_SECONDS,
+		hedge_delay=settings.PROVIDER_HEDGE_DELAY_SECONDS,
 	)
 
 
 async def get_conversion_service(
 	rate_service: Annotated[RateService, Depends(get_rate_service)],
-	currency_service: Annotated[CurrencyService, Depends(get_currency_service)],
 ) -> ConversionService:
-	return ConversionService(rate_service=rate_service, currency_service=currency_service)
+	return ConversionService(rate_service=rate_service)
@@ -1,5 +1,8 @@
+import atexit
 import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,7 +13,26 @@ from api.error_handlers import register_exception_handlers
 from api.routes import currency
 from config.settings import get_settings
 
-logging.basicConfig(level=logging.INFO)
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+	"""Route records through a queue so stream writes happen off the event loop thread."""
+	stream_handler = logging.StreamHandler()
+	stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+	log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+	listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+	queue_handler = QueueHandler(log_queue)
+	# The listener's handler adds level and logger name; the queue side renders only the
+	# message (and any traceback) so lines aren't prefixed twice.
+	queue_handler.setFormatter(logging.Formatter('%(message)s'))
+	logging.basicConfig(level=level, handlers=[queue_handler])
+	listener.start()
+	# Flush whatever is still queued when the process exits.
+	atexit.register(listener.stop)
+	return listener
+
+
+configure_logging()
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
@@ -1,7 +1,9 @@
+import sys
 from decimal import Decimal
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Path, status
+from pydantic import AfterValidator
 
 from api.dependencies import (
 	get_conversion_service,
@@ -24,6 +26,19 @@ from application.services import (
 router = APIRouter(prefix='/api', tags=['currency'])
 
 
+def normalize_currency_code(code: str) -> str:
+	# Upper-cased and interned once here, so cache keys, the in-flight map and currency
+	# lookups downstream all see the same canonical string object.
+	return sys.intern(code.upper())
+
+
+CurrencyCode = Annotated[
+	str,
+	Path(min_length=3, max_length=5),
+	AfterValidator(normalize_currency_code),
+]
+
+
 @router.get(
 	'/convert/{from_currency}/{to_currency}/{amount}',
 	response_model=ConversionResponse,
@@ -31,20 +46,8 @@ router = APIRouter(prefix='/api', tags=['currency'])
 	summary='Convert currency amount',
 )
 async def convert_currency(
-	from_currency: Annotated[
-		str,
-		Path(
-			min_length=3,
-			max_length=5,
-		),
-	],
-	to_currency: Annotated[
-		str,
-		Path(
-			min_length=3,
-			max_length=5,
-		),
-	],
+	from_currency: CurrencyCode,
+	to_currency: CurrencyCode,
 	amount: Annotated[
 		Decimal,
 		Path(
@@ -54,8 +57,6 @@ async def convert_currency(
 	],
 	service: Annotated[ConversionService, Depends(get_conversion_service)],
 ) -> ConversionResponse:
-	from_currency = from_currency.upper()
-	to_currency = to_currency.upper()
 	result = await service.convert(amount, from_currency, to_currency)
 	return ConversionResponse(**result)
 
@@ -67,25 +68,10 @@ async def convert_currency(
 	summary='Get current exchange rate',
 )
 async def get_exchange_rate(
-	from_currency: Annotated[
-		str,
-		Path(
-			min_length=3,
-			max_length=5,
-		),
-	],
-	to_currency: Annotated[
-		str,
-		Path(
-			min_length=3,
-			max_length=5,
-		),
-	],
+	from_currency: CurrencyCode,
+	to_currency: CurrencyCode,
 	service: Annotated[RateService, Depends(get_rate_service)],
 ) -> ExchangeRateResponse:
-	from_currency = from_currency.upper()
-	to_currency = to_currency.upper()
-
 	result = await service.get_rate(from_currency=from_currency, to_currency=to_currency)
 	return ExchangeRateResponse(
 		from_currency=result.from_currency,
@@ -1,5 +1,5 @@
 from .conversion_service import ConversionService
 from .currency_service import CurrencyService
-from .rate_service import RateService
+from .rate_service import RateCoordinator, RateService
 
-__all__ = ['ConversionService', 'CurrencyService', 'RateService']
+__all__ = ['ConversionService', 'CurrencyService', 'RateCoordinator', 'RateService']
@@ -10,31 +10,42 @@ logger = logging.getLogger(__name__)
 
 
 class CurrencyService:
-	def __init__(self, repository: CurrencyRepository, providers: list[ExchangeRateProvider]):
+	def __init__(
+		self,
+		repository: CurrencyRepository,
+		providers: list[ExchangeRateProvider],
+		provider_timeout: float = 5.0,
+	):
 		self.repository = repository
 		self.providers = providers
+		self.provider_timeout = provider_timeout
 
 	async def initialize_supported_currencies(self) -> None:
 		# If currencies are already persisted, skip fetching from providers entirely.
 		# This means the expensive provider calls only happen once — on first startup
 		# when the DB is empty. Every subsequent startup just uses what's already saved.
-		existing = await self.repository.get_supported_currencies()
-		if existing:
-			logger.info(
-				f'Supported currencies already initialized '
-				f'({len(existing)} currencies), skipping provider fetch.'
-			)
+		if await self.repository.has_supported_currencies():
+			logger.info('Supported currencies already initialized, skipping provider fetch.')
 			return
 
 		logger.info('No currencies found in DB, fetching from providers...')
 
-		provider_tasks = [provider.fetch_supported_currencies() for provider in self.providers]
+		# Each provider gets its own deadline so one slow provider can't stall startup.
+		provider_tasks = [
+			asyncio.wait_for(provider.fetch_supported_currencies(), timeout=self.provider_timeout)
+			for provider in self.providers
+		]
 		results = await asyncio.gather(*provider_tasks, return_exceptions=True)
 
 		all_currencies = []
 		for i, result in enumerate(results):
 			provider_name = self.providers[i].name
-			if isinstance(result, Exception):
+			if isinstance(result, TimeoutError):
+				logger.error(
+					f'Timed out fetching currencies from {provider_name} '
+					f'after {self.provider_timeout}s'
+				)
+			elif isinstance(result, Exception):
 				logger.error(f'Failed to fetch currencies from {provider_name}: {result}')
 			elif isinstance(result, list):
 				all_currencies.append(set(c['code'] for c in result))
@@ -53,7 +64,24 @@ class CurrencyService:
 		currencies = await self.repository.get_supported_currencies()
 		return [c.code for c in currencies]
 
-	async def validate_currency(self, code: str) -> None:
-		supported = await self.get_supported_currencies()
+	async def validate_currencies(self, *codes: str) -> None:
+		# One supported-codes lookup covers every code in the request.
+		supported = await self.repository.get_supported_currency_codes()
+		_check_supported(supported, codes)
+
+	def validate_currencies_locally(self, *codes: str) -> bool:
+		"""Validate against the in-process supported set without any I/O.
+
+		Returns False when that set has expired and validate_currencies() is needed.
+		"""
+		supported = self.repository.cache.get_local_supported_currency_codes()
+		if supported is None:
+			return False
+		_check_supported(supported, codes)
+		return True
+
+
+def _check_supported(supported: frozenset[str], codes: tuple[str, ...]) -> None:
+	for code in codes:
 		if code not in supported:
 			raise InvalidCurrencyError(f'Currency {code} is not supported')
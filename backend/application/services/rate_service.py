@@ -1,18 +1,123 @@
 import asyncio
+import itertools
 import logging
+import statistics
+import time
+from collections.abc import Coroutine, Sequence
 from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from application.services.currency_service import CurrencyService
-from domain.exceptions.currency import ProviderError
+from domain.exceptions.currency import CacheError, ProviderError
 from domain.models.currency import AggregatedRate, ExchangeRate
 from infrastructure.persistence.repositories.currency import CurrencyRepository
 from infrastructure.providers.base import ExchangeRateProvider
 
 logger = logging.getLogger(__name__)
 
+# A rate further than this many median absolute deviations from the median is
+# treated as a bad feed (stale, wrong pair, ...) and left out of the average.
+OUTLIER_MAD_MULTIPLIER = 3.0
+# Relative floor on the outlier limit, so tied rates (MAD of 0) don't flag a last-digit difference.
+OUTLIER_MIN_RELATIVE_DEVIATION = 1e-3
+_DECIMAL_ZERO = Decimal(0)
+# Health probes from load balancers within this window reuse the last result.
+HEALTH_CACHE_SECONDS = 2.0
+
+
+def _drop_outliers(rates: dict[str, Decimal]) -> dict[str, Decimal]:
+	if len(rates) < 3:
+		return rates
+
+	# Screening only decides which rates to keep, so floats are precise enough; the
+	# average itself is still computed in Decimal from the kept rates.
+	values = {name: float(rate) for name, rate in rates.items()}
+	median = statistics.median(values.values())
+	deviations = {name: abs(value - median) for name, value in values.items()}
+	limit = max(
+		statistics.median(deviations.values()) * OUTLIER_MAD_MULTIPLIER,
+		abs(median) * OUTLIER_MIN_RELATIVE_DEVIATION,
+	)
+	return {name: rates[name] for name, deviation in deviations.items() if deviation <= limit}
+
+
+def _combine_rates(
+	from_currency: str, to_currency: str, rates: dict[str, Decimal]
+) -> AggregatedRate:
+	"""Screen outliers and average the provider rates. Pure and synchronous."""
+	if len(rates) == 1:
+		# The common primary-only case: nothing to screen or average.
+		used = rates
+		avg_rate = next(iter(rates.values()))
+	else:
+		used = _drop_outliers(rates)
+		if len(used) < len(rates):
+			excluded = {name: str(rate) for name, rate in rates.items() if name not in used}
+			logger.warning(f'Excluding outlier rates for {from_currency}/{to_currency}: {excluded}')
+		avg_rate = sum(used.values(), _DECIMAL_ZERO) / len(used)
+
+	return AggregatedRate(
+		from_currency=from_currency,
+		to_currency=to_currency,
+		rate=avg_rate,
+		timestamp=datetime.now(),
+		sources=list(used.keys()),
+		individual_rates=rates,
+	)
+
+
+class RateCoordinator:
+	"""App-scoped state shared by the per-request RateService instances."""
+
+	def __init__(self) -> None:
+		# Provider fetches in progress, so concurrent cache misses for a pair trigger
+		# a single fan-out.
+		self.inflight: dict[tuple[str, str], asyncio.Task[ExchangeRate]] = {}
+		# Counts provider fetches to pick which ones run the full comparison.
+		self.fetch_counter = itertools.count(1)
+		# Strong references to fire-and-forget work (cache writes) so it isn't garbage
+		# collected mid-flight.
+		self.background_tasks: set[asyncio.Task[None]] = set()
+		# (expires_at, result) of the last provider health check, on the monotonic clock.
+		self.health_cache: tuple[float, list[dict[str, str | None]]] | None = None
+
+	def run_in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+		task = asyncio.create_task(coro)
+		self.background_tasks.add(task)
+		task.add_done_callback(self._background_task_done)
+
+	def start_fetch(
+		self, key: tuple[str, str], coro: Coroutine[Any, Any, ExchangeRate]
+	) -> asyncio.Task[ExchangeRate]:
+		fetch = asyncio.create_task(coro)
+		self.inflight[key] = fetch
+		fetch.add_done_callback(lambda task: self._fetch_done(key, task))
+		return fetch
+
+	async def drain(self) -> None:
+		"""Wait for in-flight fetches and pending fire-and-forget work; called once at shutdown."""
+		# A finishing fetch schedules its cache write, so repeat until both are empty.
+		while self.inflight or self.background_tasks:
+			await asyncio.gather(
+				*self.inflight.values(), *self.background_tasks, return_exceptions=True
+			)
+
+	def _fetch_done(self, key: tuple[str, str], task: asyncio.Task[ExchangeRate]) -> None:
+		if self.inflight.get(key) is task:
+			del self.inflight[key]
+		# Waiters get the error themselves; retrieving it here keeps a fetch whose
+		# waiters were all cancelled from being reported as never retrieved.
+		if not task.cancelled():
+			task.exception()
+
+	def _background_task_done(self, task: asyncio.Task[None]) -> None:
+		self.background_tasks.discard(task)
+		if not task.cancelled() and task.exception() is not None:
+			logger.error(f'Background task failed: {task.exception()}')
+
 
 class RateService:
 	def __init__(
@@ -21,23 +126,95 @@ class RateService:
 		repository: CurrencyRepository,
 		primary_provider: ExchangeRateProvider,
 		secondary_providers: list[ExchangeRateProvider],
+		coordinator: RateCoordinator,
+		compare_every: int = 100,
+		provider_timeout: float = 5.0,
+		hedge_delay: float = 0.4,
 	):
 		self.currency_service = currency_service
 		self.repository = repository
 		self.primary_provider = primary_provider
-		self.secondary_providers = secondary_providers
+		self.secondary_providers = tuple(secondary_providers)
+		self.providers = (primary_provider, *secondary_providers)
+		self.coordinator = coordinator
+		# Every Nth provider fetch queries all providers and averages the results (0 never
+		# does). The rest ask the primary only and fall back to secondaries if it fails.
+		self.compare_every = compare_every
+		self.provider_timeout = provider_timeout
+		# How long an uncompared miss waits on the primary before racing the secondaries.
+		self.hedge_delay = hedge_delay
 
 	async def get_rate(self, from_currency: str, to_currency: str) -> ExchangeRate:
-		await self.currency_service.validate_currency(from_currency)
-		await self.currency_service.validate_currency(to_currency)
-
-		cached_rate = await self.repository.cache.get_rate(from_currency, to_currency)
+		if self.currency_service.validate_currencies_locally(from_currency, to_currency):
+			cached_rate, stale_payload = await self.repository.cache.get_rate_with_stale(
+				from_currency, to_currency
+			)
+		else:
+			cached_rate, stale_payload = await self._validate_and_read_cache(
+				from_currency, to_currency
+			)
 		if cached_rate:
-			logger.info(f'Cache HIT: {from_currency}/{to_currency}')
+			logger.debug('Cache HIT: %s/%s', from_currency, to_currency)
 			return cached_rate
 
-		logger.info(f'Cache MISS: {from_currency}/{to_currency}, fetching from providers')
+		key = (from_currency, to_currency)
+		fetch = self.coordinator.inflight.get(key)
+		if fetch is None:
+			logger.info(f'Cache MISS: {from_currency}/{to_currency}, fetching from providers')
+			fetch = self.coordinator.start_fetch(key, self._fetch_rate(from_currency, to_currency))
+		else:
+			logger.debug('Joining in-flight fetch for %s/%s', from_currency, to_currency)
+
+		try:
+			# Shielded so a disconnecting client doesn't cancel the fetch other callers await.
+			return await asyncio.shield(fetch)
+		except ProviderError:
+			# Redis keeps the last rate for a day; past that, history is the last resort.
+			stale_rate = self._decode_stale_rate(stale_payload, from_currency, to_currency)
+			if stale_rate is None:
+				try:
+					stale_rate = await self.repository.get_latest_rate(from_currency, to_currency)
+				except Exception as e:
+					# The outage is what the caller needs to hear about, not the fallback's failure.
+					logger.error(
+						f'Rate history lookup failed for {from_currency}/{to_currency}: {e}'
+					)
+			if stale_rate is None:
+				raise
+			logger.warning(
+				f'All providers failed for {from_currency}/{to_currency}, '
+				f'serving stale rate from {stale_rate.timestamp.isoformat()}'
+			)
+			return stale_rate
+
+	async def _validate_and_read_cache(
+		self, from_currency: str, to_currency: str
+	) -> tuple[ExchangeRate | None, str | None]:
+		# Validation has to go to Redis or the database here, so the cache read's
+		# round trip overlaps it; an unsupported pair just discards the read.
+		cache_read = asyncio.create_task(
+			self.repository.cache.get_rate_with_stale(from_currency, to_currency)
+		)
+		try:
+			await self.currency_service.validate_currencies(from_currency, to_currency)
+		except BaseException:
+			# Also marks a read that already failed as handled, so its error isn't
+			# reported as never retrieved.
+			cache_read.cancel()
+			raise
+
+		return await cache_read
+
+	def _decode_stale_rate(
+		self, payload: str | None, from_currency: str, to_currency: str
+	) -> ExchangeRate | None:
+		try:
+			return self.repository.cache.decode_rate(payload)
+		except CacheError as e:
+			logger.warning(f'Ignoring unreadable stale rate for {from_currency}/{to_currency}: {e}')
+			return None
 
+	async def _fetch_rate(self, from_currency: str, to_currency: str) -> ExchangeRate:
 		aggregated = await self._aggregate_rates(from_currency, to_currency)
 
 		rate = ExchangeRate(
@@ -48,7 +225,10 @@ class RateService:
 			source='averaged' if len(aggregated.sources) > 1 else aggregated.sources[0],
 		)
 
-		await self.repository.save_rate(rate)
+		# The history row is queued now; the Redis write doesn't need to hold up the
+		# response, the rate is returned to every waiter either way.
+		self.repository.add_rate_history(rate)
+		self.coordinator.run_in_background(self.repository.cache.set_rate(rate))
 
 		return rate
 
@@ -61,48 +241,118 @@ class RateService:
 		self, provider: ExchangeRateProvider, from_currency: str, to_currency: str
 	) -> Decimal | None:
 		try:
-			return await provider.fetch_rate(from_currency, to_currency)
+			async with asyncio.timeout(self.provider_timeout):
+				return await provider.fetch_rate(from_currency, to_currency)
+		except TimeoutError:
+			logger.error(f'Provider {provider.name} timed out after {self.provider_timeout}s')
+			return None
 		except Exception as e:
 			logger.error(f'Provider {provider.name} failed: {e}')
 			return None
 
-	async def _aggregate_rates(self, from_currency: str, to_currency: str) -> AggregatedRate:
-		tasks = []
-		providers = [self.primary_provider] + self.secondary_providers
-		for provider in providers:
-			tasks.append(self._fetch_from_provider(provider, from_currency, to_currency))
-
+	async def _collect_rates(
+		self, providers: Sequence[ExchangeRateProvider], from_currency: str, to_currency: str
+	) -> dict[str, Decimal]:
+		tasks = [
+			self._fetch_from_provider(provider, from_currency, to_currency)
+			for provider in providers
+		]
 		results = await asyncio.gather(*tasks)
 
 		rates: dict[str, Decimal] = {}
 		for provider, rate in zip(providers, results, strict=False):
 			if rate is not None:
 				rates[provider.name] = rate
+		return rates
 
-		if not rates:
-			raise ProviderError(f'All providers failed for {from_currency} → {to_currency}')
+	def _start_fetches(
+		self, providers: Sequence[ExchangeRateProvider], from_currency: str, to_currency: str
+	) -> dict[asyncio.Task[Decimal | None], ExchangeRateProvider]:
+		tasks: dict[asyncio.Task[Decimal | None], ExchangeRateProvider] = {}
+		for provider in providers:
+			task = asyncio.create_task(
+				self._fetch_from_provider(provider, from_currency, to_currency)
+			)
+			tasks[task] = provider
+		return tasks
+
+	async def _first_rate(
+		self, tasks: dict[asyncio.Task[Decimal | None], ExchangeRateProvider]
+	) -> dict[str, Decimal]:
+		# Race the fetches and keep the first usable rate; stragglers are cancelled
+		# so their sockets are released instead of running to completion.
+		pending = set(tasks)
+		try:
+			while pending:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					rate = task.result()
+					if rate is not None:
+						return {tasks[task].name: rate}
+			return {}
+		finally:
+			for task in pending:
+				task.cancel()
+			await asyncio.gather(*pending, return_exceptions=True)
+
+	async def _primary_rate(self, from_currency: str, to_currency: str) -> dict[str, Decimal]:
+		tasks = self._start_fetches(self.providers[:1], from_currency, to_currency)
+		try:
+			done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+		except asyncio.CancelledError:
+			for task in tasks:
+				task.cancel()
+			raise
+
+		if not done:
+			# The primary is slower than usual: hedge with the secondaries and keep
+			# whichever provider answers first, the primary included.
+			logger.info(
+				f'Primary provider {self.primary_provider.name} slow for '
+				f'{from_currency}/{to_currency}, hedging with secondary providers'
+			)
+			tasks |= self._start_fetches(self.secondary_providers, from_currency, to_currency)
+			return await self._first_rate(tasks)
 
-		avg_rate = sum(rates.values()) / Decimal(len(rates))
+		rate = done.pop().result()
+		if rate is not None:
+			return {self.primary_provider.name: rate}
 
-		return AggregatedRate(
-			from_currency=from_currency,
-			to_currency=to_currency,
-			rate=avg_rate,
-			timestamp=datetime.now(),
-			sources=list(rates.keys()),
-			individual_rates=rates,
+		logger.warning(
+			f'Primary provider {self.primary_provider.name} failed for '
+			f'{from_currency}/{to_currency}, trying secondary providers'
 		)
+		return await self._first_rate(
+			self._start_fetches(self.secondary_providers, from_currency, to_currency)
+		)
+
+	async def _aggregate_rates(self, from_currency: str, to_currency: str) -> AggregatedRate:
+		if self.compare_every and next(self.coordinator.fetch_counter) % self.compare_every == 0:
+			rates = await self._collect_rates(self.providers, from_currency, to_currency)
+		else:
+			rates = await self._primary_rate(from_currency, to_currency)
+
+		if not rates:
+			raise ProviderError(f'All providers failed for {from_currency} → {to_currency}')
+
+		return _combine_rates(from_currency, to_currency, rates)
 
 	async def get_provider_health(self) -> list[dict[str, str | None]]:
-		providers = [self.primary_provider] + self.secondary_providers
-		health: list[dict[str, str | None]] = []
+		cached = self.coordinator.health_cache
+		if cached is not None and time.monotonic() < cached[0]:
+			return cached[1]
 
-		for provider in providers:
-			try:
+		health = list(await asyncio.gather(*map(self._check_provider, self.providers)))
+		self.coordinator.health_cache = (time.monotonic() + HEALTH_CACHE_SECONDS, health)
+		return health
+
+	async def _check_provider(self, provider: ExchangeRateProvider) -> dict[str, str | None]:
+		try:
+			async with asyncio.timeout(self.provider_timeout):
 				await provider.fetch_supported_currencies()
-				health.append({'name': provider.name, 'status': 'operational', 'error': None})
-			except Exception as e:
-				logger.error(f'Provider {provider.name} health check failed: {e}')
-				health.append({'name': provider.name, 'status': 'down', 'error': str(e)})
+		except Exception as e:
+			error = str(e) or type(e).__name__
+			logger.error(f'Provider {provider.name} health check failed: {error}')
+			return {'name': provider.name, 'status': 'down', 'error': error}
 
-		return health
+		return {'name': provider.name, 'status': 'operational', 'error': None}
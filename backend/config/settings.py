@@ -5,12 +5,26 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
 	DATABASE_URL: str = 'sqlite+aiosqlite:///./currency_converter.db'
+	# Per worker process; keep workers * (pool size + overflow) under Postgres max_connections.
+	DB_POOL_SIZE: int = 10
+	DB_MAX_OVERFLOW: int = 4
+	DB_POOL_RECYCLE_SECONDS: int = 1800
 
 	REDIS_URL: str = 'redis://localhost:6379'
+	REDIS_MAX_CONNECTIONS: int = 50
+	REDIS_POOL_TIMEOUT_SECONDS: float = 2.0
 
 	FIXERIO_API_KEY: str = ''
 	OPENEXCHANGE_APP_ID: str = ''
 	CURRENCYAPI_KEY: str = ''
+	PROVIDER_TIMEOUT_SECONDS: float = 5.0
+	# When only the primary is queried, race the secondaries if it hasn't answered by then.
+	PROVIDER_HEDGE_DELAY_SECONDS: float = 0.4
+	# Caps in-flight HTTP calls per provider; extra calls wait for a free connection.
+	PROVIDER_MAX_CONNECTIONS: int = 20
+	# Average every provider on one in N cache misses (1 = all, 0 = never); the other
+	# misses query the primary provider alone and use secondaries only as fallback.
+	RATE_COMPARE_EVERY: int = 100
 
 	# Application
 	APP_NAME: str = 'Currency Converter API'
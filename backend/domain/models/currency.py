@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExchangeRate:
 	from_currency: str
 	to_currency: str
@@ -12,13 +12,13 @@ class ExchangeRate:
 	source: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SupportedCurrency:
 	code: str
 	name: str | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AggregatedRate:
 	from_currency: str
 	to_currency: str
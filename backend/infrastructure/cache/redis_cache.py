@@ -1,7 +1,8 @@
-import json
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import orjson
 from redis import asyncio as redis
 
 from domain.exceptions.currency import CacheError
@@ -9,23 +10,50 @@ from domain.models.currency import ExchangeRate
 
 
 class RedisCacheService:
+	SUPPORTED_CURRENCIES_KEY = 'currencies:supported'
+
 	def __init__(self, redis_client: redis.Redis):
 		self.redis = redis_client
 		self.rate_ttl = timedelta(minutes=5)
+		# A longer-lived copy of each rate, served only when every provider is down.
+		self.stale_rate_ttl = timedelta(hours=24)
 		self.currency_ttl = timedelta(hours=24)
+		# Supported currencies are read on every validation but change almost never,
+		# so a short-lived in-process copy saves a Redis round trip per request.
+		self.local_currency_ttl = timedelta(seconds=60)
+		self._local_currencies: tuple[float, list[str], frozenset[str]] | None = None
 
 	def _make_rate_key(self, from_currency: str, to_currency: str) -> str:
 		return f'rate:{from_currency}:{to_currency}'
 
+	def _make_stale_rate_key(self, from_currency: str, to_currency: str) -> str:
+		return f'stale:rate:{from_currency}:{to_currency}'
+
 	async def get_rate(self, from_currency: str, to_currency: str) -> ExchangeRate | None:
 		key = self._make_rate_key(from_currency, to_currency)
-		data = await self.redis.get(key)
+		return self.decode_rate(await self.redis.get(key))
+
+	async def get_rate_with_stale(
+		self, from_currency: str, to_currency: str
+	) -> tuple[ExchangeRate | None, str | None]:
+		"""Fetch the fresh and the stale copy of a rate in a single round trip.
 
+		The stale copy is returned undecoded: it is only needed when every provider
+		fails, so callers pass it to decode_rate() then.
+		"""
+		fresh, stale = await self.redis.mget(
+			self._make_rate_key(from_currency, to_currency),
+			self._make_stale_rate_key(from_currency, to_currency),
+		)
+		return self.decode_rate(fresh), stale
+
+	@staticmethod
+	def decode_rate(data: str | None) -> ExchangeRate | None:
 		if not data:
 			return None
 
 		try:
-			rate_dict = json.loads(data)
+			rate_dict = orjson.loads(data)
 			return ExchangeRate(
 				from_currency=rate_dict['from_currency'],
 				to_currency=rate_dict['to_currency'],
@@ -33,12 +61,12 @@ class RedisCacheService:
 				timestamp=datetime.fromisoformat(rate_dict['timestamp']),
 				source=rate_dict['source'],
 			)
-		except json.decoder.JSONDecodeError as e:
+		except orjson.JSONDecodeError as e:
 			raise CacheError('Invalid json data decoded') from e
+		except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+			raise CacheError(f'Malformed cached rate: {e!r}') from e
 
 	async def set_rate(self, rate: ExchangeRate) -> None:
-		key = self._make_rate_key(rate.from_currency, rate.to_currency)
-
 		rate_dict = {
 			'from_currency': rate.from_currency,
 			'to_currency': rate.to_currency,
@@ -47,16 +75,60 @@ class RedisCacheService:
 			'source': rate.source,
 		}
 
-		await self.redis.setex(key, self.rate_ttl, json.dumps(rate_dict))
+		payload = orjson.dumps(rate_dict)
+
+		pipe = self.redis.pipeline(transaction=False)
+		pipe.setex(
+			self._make_rate_key(rate.from_currency, rate.to_currency), self.rate_ttl, payload
+		)
+		pipe.setex(
+			self._make_stale_rate_key(rate.from_currency, rate.to_currency),
+			self.stale_rate_ttl,
+			payload,
+		)
+		await pipe.execute()
+
+	def _remember_currencies(self, currencies: list[str]) -> None:
+		expires_at = time.monotonic() + self.local_currency_ttl.total_seconds()
+		self._local_currencies = (expires_at, currencies, frozenset(currencies))
+
+	def _local_copy(self) -> tuple[float, list[str], frozenset[str]] | None:
+		if self._local_currencies is not None and time.monotonic() < self._local_currencies[0]:
+			return self._local_currencies
+		return None
 
 	async def get_supported_currencies(self) -> list[str] | None:
-		data = await self.redis.get('currencies:supported')
+		local = self._local_copy()
+		if local is not None:
+			return local[1]
+
+		data = await self.redis.get(self.SUPPORTED_CURRENCIES_KEY)
 		if not data:
 			return None
 		try:
-			return json.loads(data)
-		except json.decoder.JSONDecodeError as e:
+			currencies = orjson.loads(data)
+		except orjson.JSONDecodeError as e:
 			raise CacheError('Invalid json data decoded') from e
 
+		self._remember_currencies(currencies)
+		return currencies
+
+	async def get_supported_currency_codes(self) -> frozenset[str] | None:
+		"""Same data as a set, built once per refresh for the per-request validation."""
+		local = self._local_copy()
+		if local is None and await self.get_supported_currencies() is not None:
+			local = self._local_currencies
+		return local[2] if local is not None else None
+
+	def get_local_supported_currency_codes(self) -> frozenset[str] | None:
+		"""The in-process supported set if it is still fresh; never touches Redis."""
+		local = self._local_copy()
+		return local[2] if local is not None else None
+
 	async def set_supported_currencies(self, currencies: list[str]) -> None:
-		await self.redis.setex('currencies:supported', self.currency_ttl, json.dumps(currencies))
+		await self.redis.setex(
+			self.SUPPORTED_CURRENCIES_KEY,
+			self.currency_ttl,
+			orjson.dumps(currencies),
+		)
+		self._remember_currencies(currencies)
@@ -1,13 +1,56 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
+from sqlalchemy import Insert, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from infrastructure.persistence.models.currency import Base
 
+logger = logging.getLogger(__name__)
+
+# Connections opened at startup; enough to absorb the first requests, not the whole pool.
+WARM_UP_CONNECTIONS = 2
+
+_DIALECT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _to_async_url(db_url: str) -> str:
+	# Plain postgresql:// URLs would load the blocking psycopg2 driver, which the
+	# async engine rejects. Route them through asyncpg, as alembic/env.py does.
+	if db_url.startswith('postgresql://'):
+		return db_url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+	return db_url
+
+
+def insert_ignoring_conflicts(session: AsyncSession, model: type[Base]) -> Insert:
+	"""Build an INSERT that lets the database skip rows violating a unique key."""
+	dialect = session.get_bind().dialect.name
+	return _DIALECT_INSERTS[dialect](model).on_conflict_do_nothing()
+
 
 class Database:
-	def __init__(self, db_url: str):
-		self.engine = create_async_engine(db_url)
+	def __init__(
+		self,
+		db_url: str,
+		pool_size: int = 10,
+		max_overflow: int = 4,
+		pool_recycle: int = 1800,
+	):
+		url = _to_async_url(db_url)
+		self.pool_size = pool_size
+		if url.startswith('sqlite'):
+			# SQLite has no server-side connection limit worth tuning.
+			self.engine = create_async_engine(url)
+		else:
+			self.engine = create_async_engine(
+				url,
+				pool_size=pool_size,
+				max_overflow=max_overflow,
+				pool_pre_ping=True,
+				pool_recycle=pool_recycle,
+			)
 		self.session_factory = async_sessionmaker(
 			self.engine, class_=AsyncSession, autoflush=True, expire_on_commit=False
 		)
@@ -20,6 +63,22 @@ class Database:
 		async with self.engine.begin() as conn:
 			await conn.run_sync(Base.metadata.drop_all)
 
+	async def warm_up(self) -> None:
+		"""Open a few pool connections up front so first requests skip the handshake."""
+
+		async def _touch() -> None:
+			async with self.engine.connect() as conn:
+				await conn.execute(text('SELECT 1'))
+
+		count = min(self.pool_size, WARM_UP_CONNECTIONS)
+		results = await asyncio.gather(*(_touch() for _ in range(count)), return_exceptions=True)
+		failures = [r for r in results if isinstance(r, BaseException)]
+		if failures:
+			# Best effort only: requests will open connections on demand.
+			logger.warning(
+				f'Database warm-up failed for {len(failures)} connection(s): {failures[0]}'
+			)
+
 	async def close(self) -> None:
 		await self.engine.dispose()
 
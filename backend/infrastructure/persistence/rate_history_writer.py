@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import logging
+
+from domain.models.currency import ExchangeRate
+from infrastructure.persistence.database import Database, insert_ignoring_conflicts
+from infrastructure.persistence.models.currency import RateHistoryDB
+
+logger = logging.getLogger(__name__)
+
+
+class RateHistoryWriter:
+	"""Buffers rate history rows and writes them in batches off the request path."""
+
+	def __init__(
+		self,
+		db: Database,
+		max_queue_size: int = 10_000,
+		batch_size: int = 100,
+		flush_interval: float = 0.5,
+		close_timeout: float = 5.0,
+	):
+		self.db = db
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		# Upper bound on the shutdown flush, so an unreachable database can't hang it.
+		self.close_timeout = close_timeout
+		self._queue: asyncio.Queue[ExchangeRate] = asyncio.Queue(maxsize=max_queue_size)
+		self._worker: asyncio.Task | None = None
+
+	def start(self) -> None:
+		if self._worker is None:
+			self._worker = asyncio.create_task(self._run())
+
+	def enqueue(self, rate: ExchangeRate) -> None:
+		try:
+			self._queue.put_nowait(rate)
+		except asyncio.QueueFull:
+			logger.warning(
+				f'Rate history queue full, dropping {rate.from_currency}/{rate.to_currency}'
+			)
+
+	async def close(self) -> None:
+		"""Flush everything already queued, then stop the worker."""
+		if self._worker is None:
+			return
+
+		try:
+			async with asyncio.timeout(self.close_timeout):
+				await self._queue.join()
+		except TimeoutError:
+			logger.error(
+				f'Rate history flush timed out after {self.close_timeout}s, '
+				f'dropping {self._queue.qsize()} queued rows'
+			)
+		self._worker.cancel()
+		with contextlib.suppress(asyncio.CancelledError):
+			await self._worker
+		self._worker = None
+
+	async def _run(self) -> None:
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = [await self._queue.get()]
+			deadline = loop.time() + self.flush_interval
+			while len(batch) < self.batch_size:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				try:
+					batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+				except TimeoutError:
+					break
+
+			await self._write(batch)
+			for _ in batch:
+				self._queue.task_done()
+
+	async def _write(self, batch: list[ExchangeRate]) -> None:
+		rows = [
+			{
+				'from_currency': rate.from_currency,
+				'to_currency': rate.to_currency,
+				'rate': rate.rate,
+				'timestamp': rate.timestamp,
+				'source': rate.source,
+			}
+			for rate in batch
+		]
+		try:
+			async with self.db.managed_session() as session:
+				await session.execute(insert_ignoring_conflicts(session, RateHistoryDB), rows)
+		except Exception as e:
+			logger.error(f'Failed to write {len(rows)} rate history rows: {e}')
@@ -1,23 +1,32 @@
 import logging
 from datetime import datetime
 
+from sqlalchemy import exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from domain.models.currency import ExchangeRate, SupportedCurrency
 from infrastructure.cache.redis_cache import RedisCacheService
+from infrastructure.persistence.database import insert_ignoring_conflicts
 from infrastructure.persistence.models.currency import (
 	RateHistoryDB,
 	SupportedCurrencyDB,
 )
+from infrastructure.persistence.rate_history_writer import RateHistoryWriter
 
 logger = logging.getLogger(__name__)
 
 
 class CurrencyRepository:
-	def __init__(self, db_session: AsyncSession, cache_service: RedisCacheService):
+	def __init__(
+		self,
+		db_session: AsyncSession,
+		cache_service: RedisCacheService,
+		history_writer: RateHistoryWriter | None = None,
+	):
 		self.db_session = db_session
 		self.cache = cache_service
+		self.history_writer = history_writer
 
 	async def get_supported_currencies(self) -> list[SupportedCurrency]:
 		cached_codes = await self.cache.get_supported_currencies()
@@ -33,19 +42,37 @@ class CurrencyRepository:
 
 		return domain_currencies
 
+	async def has_supported_currencies(self) -> bool:
+		# EXISTS lets the database stop at the first row instead of loading them all.
+		return bool(await self.db_session.scalar(select(exists().select_from(SupportedCurrencyDB))))
+
+	async def get_supported_currency_codes(self) -> frozenset[str]:
+		cached_codes = await self.cache.get_supported_currency_codes()
+		if cached_codes:
+			return cached_codes
+
+		result = await self.db_session.execute(select(SupportedCurrencyDB.code))
+		codes = result.scalars().all()
+
+		if codes:
+			await self.cache.set_supported_currencies(list(codes))
+
+		return frozenset(codes)
+
 	async def save_supported_currencies(self, currencies: list[SupportedCurrency]) -> None:
-		existing_codes = (
-			(await self.db_session.execute(select(SupportedCurrencyDB.code))).scalars().all()
-		)
-		new_currencies = [c for c in currencies if c.code not in existing_codes]
+		if not currencies:
+			return
 
-		if new_currencies:
-			self.db_session.add_all(
-				[SupportedCurrencyDB(code=c.code, name=c.name) for c in new_currencies]
-			)
+		# Single round trip: the primary key rejects codes that are already stored.
+		stmt = insert_ignoring_conflicts(self.db_session, SupportedCurrencyDB).values(
+			[{'code': c.code, 'name': c.name} for c in currencies]
+		)
+		await self.db_session.execute(stmt)
 
-	async def save_rate(self, rate: ExchangeRate) -> None:
-		await self.cache.set_rate(rate)
+	def add_rate_history(self, rate: ExchangeRate) -> None:
+		if self.history_writer is not None:
+			self.history_writer.enqueue(rate)
+			return
 
 		self.db_session.add(
 			RateHistoryDB(
@@ -82,3 +109,29 @@ class CurrencyRepository:
 			)
 			for r in db_rates
 		]
+
+	async def get_latest_rate(self, from_currency: str, to_currency: str) -> ExchangeRate | None:
+		stmt = (
+			select(
+				RateHistoryDB.rate,
+				RateHistoryDB.timestamp,
+				RateHistoryDB.source,
+			)
+			.filter(
+				RateHistoryDB.from_currency == from_currency,
+				RateHistoryDB.to_currency == to_currency,
+			)
+			.order_by(RateHistoryDB.timestamp.desc())
+			.limit(1)
+		)
+		row = (await self.db_session.execute(stmt)).first()
+		if row is None:
+			return None
+
+		return ExchangeRate(
+			from_currency=from_currency,
+			to_currency=to_currency,
+			rate=row.rate,
+			timestamp=row.timestamp,
+			source=row.source or 'unknown',
+		)
@@ -9,11 +9,18 @@ from domain.exceptions.currency import ProviderError
 class CurrencyAPIProvider:
 	BASE_URL = 'https://api.currencyapi.com/v3'
 
-	def __init__(self, api_key: str, client: httpx.AsyncClient | None = None, timeout: int = 10):
+	def __init__(
+		self,
+		api_key: str,
+		client: httpx.AsyncClient | None = None,
+		timeout: int = 10,
+		max_connections: int = 20,
+	):
 		self.api_key = api_key
 		self._client = client or httpx.AsyncClient(
 			timeout=timeout,
 			headers={'apikey': api_key},
+			limits=httpx.Limits(max_connections=max_connections),
 		)
 
 	@property
@@ -8,9 +8,17 @@ from domain.exceptions.currency import ProviderError
 class FixerIOProvider:
 	BASE_URL = 'http://data.fixer.io/api'
 
-	def __init__(self, api_key: str, client: httpx.AsyncClient | None = None, timeout: int = 10):
+	def __init__(
+		self,
+		api_key: str,
+		client: httpx.AsyncClient | None = None,
+		timeout: int = 10,
+		max_connections: int = 20,
+	):
 		self.api_key = api_key
-		self._client = client or httpx.AsyncClient(timeout=timeout)
+		self._client = client or httpx.AsyncClient(
+			timeout=timeout, limits=httpx.Limits(max_connections=max_connections)
+		)
 
 	@property
 	def name(self) -> str:
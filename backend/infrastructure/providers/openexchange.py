@@ -8,9 +8,17 @@ from domain.exceptions.currency import ProviderError
 class OpenExchangeProvider:
 	BASE_URL = 'https://openexchangerates.org/api'
 
-	def __init__(self, app_id: str, client: httpx.AsyncClient | None = None, timeout: int = 10):
+	def __init__(
+		self,
+		app_id: str,
+		client: httpx.AsyncClient | None = None,
+		timeout: int = 10,
+		max_connections: int = 20,
+	):
 		self.app_id = app_id
-		self._client = client or httpx.AsyncClient(timeout=timeout)
+		self._client = client or httpx.AsyncClient(
+			timeout=timeout, limits=httpx.Limits(max_connections=max_connections)
+		)
 
 	@property
 	def name(self) -> str:
@@ -0,0 +1,120 @@
+# nosec B101
+
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from application.services.currency_service import CurrencyService
+from domain.exceptions.currency import InvalidCurrencyError, ProviderError
+
+
+def make_provider(name, codes=None, error=None):
+    provider = MagicMock()
+    provider.name = name
+    currencies = [{'code': code, 'name': None} for code in codes or []]
+    provider.fetch_supported_currencies = AsyncMock(return_value=currencies, side_effect=error)
+    return provider
+
+
+def make_service(providers, seeded=False, supported=frozenset(), **kwargs):
+    repository = MagicMock()
+    repository.has_supported_currencies = AsyncMock(return_value=seeded)
+    repository.get_supported_currency_codes = AsyncMock(return_value=supported)
+    repository.save_supported_currencies = AsyncMock()
+    repository.cache.set_supported_currencies = AsyncMock()
+    repository.cache.get_local_supported_currency_codes = MagicMock(return_value=None)
+    return CurrencyService(repository=repository, providers=providers, **kwargs)
+
+
+# ============================================================================
+# TEST: validate_currencies()
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_validate_currencies_accepts_supported_codes_with_one_lookup():
+    service = make_service([], supported=frozenset({'USD', 'EUR'}))
+
+    await service.validate_currencies('USD', 'EUR')
+
+    service.repository.get_supported_currency_codes.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_validate_currencies_rejects_unsupported_code():
+    service = make_service([], supported=frozenset({'USD', 'EUR'}))
+
+    with pytest.raises(InvalidCurrencyError, match='XYZ'):
+        await service.validate_currencies('USD', 'XYZ')
+
+
+@pytest.mark.asyncio
+async def test_validate_currencies_locally_uses_in_process_set():
+    service = make_service([])
+    service.repository.cache.get_local_supported_currency_codes.return_value = frozenset(
+        {'USD', 'EUR'}
+    )
+
+    assert service.validate_currencies_locally('USD', 'EUR') is True
+    with pytest.raises(InvalidCurrencyError, match='XYZ'):
+        service.validate_currencies_locally('USD', 'XYZ')
+    service.repository.get_supported_currency_codes.assert_not_called()
+
+
+def test_validate_currencies_locally_defers_when_set_expired():
+    service = make_service([])
+
+    assert service.validate_currencies_locally('USD', 'EUR') is False
+
+
+# ============================================================================
+# TEST: initialize_supported_currencies() - Seeding
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_initialize_skips_providers_when_already_seeded():
+    provider = make_provider('fixerio', ['USD'])
+    service = make_service([provider], seeded=True)
+
+    await service.initialize_supported_currencies()
+
+    provider.fetch_supported_currencies.assert_not_called()
+    service.repository.save_supported_currencies.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_initialize_saves_intersection_of_provider_currencies():
+    service = make_service([
+        make_provider('fixerio', ['USD', 'EUR', 'GBP']),
+        make_provider('openexchange', ['USD', 'EUR', 'JPY']),
+    ])
+
+    await service.initialize_supported_currencies()
+
+    saved = service.repository.save_supported_currencies.call_args[0][0]
+    assert {c.code for c in saved} == {'USD', 'EUR'}
+
+
+@pytest.mark.asyncio
+async def test_initialize_drops_provider_that_times_out():
+    async def hang():
+        await asyncio.sleep(10)
+
+    slow = make_provider('openexchange')
+    slow.fetch_supported_currencies = AsyncMock(side_effect=hang)
+    service = make_service(
+        [make_provider('fixerio', ['USD', 'EUR']), slow], provider_timeout=0.01
+    )
+
+    await service.initialize_supported_currencies()
+
+    saved = service.repository.save_supported_currencies.call_args[0][0]
+    assert {c.code for c in saved} == {'USD', 'EUR'}
+
+
+@pytest.mark.asyncio
+async def test_initialize_raises_when_every_provider_fails():
+    service = make_service([make_provider('fixerio', error=ProviderError('down'))])
+
+    with pytest.raises(ProviderError):
+        await service.initialize_supported_currencies()
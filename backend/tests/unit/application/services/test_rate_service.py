@@ -0,0 +1,568 @@
+# nosec B101
+
+
+import asyncio
+import gc
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from application.services.rate_service import RateCoordinator, RateService, _drop_outliers
+from domain.exceptions.currency import InvalidCurrencyError, ProviderError
+from domain.models.currency import ExchangeRate
+from infrastructure.cache.redis_cache import RedisCacheService
+
+STALE_PAYLOAD = (
+    '{"from_currency": "USD", "to_currency": "EUR", "rate": "0.89", '
+    '"timestamp": "2025-11-05T00:00:00", "source": "fixerio"}'
+)
+
+
+def make_provider(name, rate=None, error=None):
+    provider = MagicMock()
+    provider.name = name
+    provider.fetch_rate = AsyncMock(return_value=rate, side_effect=error)
+    return provider
+
+
+def make_service(primary, secondaries, **kwargs):
+    currency_service = MagicMock()
+    currency_service.validate_currencies = AsyncMock()
+    currency_service.validate_currencies_locally = MagicMock(return_value=False)
+    repository = MagicMock()
+    repository.cache.get_rate_with_stale = AsyncMock(return_value=(None, None))
+    repository.get_latest_rate = AsyncMock(return_value=None)
+    repository.cache.set_rate = AsyncMock()
+    repository.cache.decode_rate = MagicMock(side_effect=RedisCacheService.decode_rate)
+    kwargs.setdefault('coordinator', RateCoordinator())
+    return RateService(
+        currency_service=currency_service,
+        repository=repository,
+        primary_provider=primary,
+        secondary_providers=secondaries,
+        **kwargs,
+    )
+
+
+# ============================================================================
+# TEST: _aggregate_rates() - Provider fan-out
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_full_comparison_averages_all_providers():
+    primary = make_provider('fixerio', Decimal('0.90'))
+    secondary = make_provider('openexchange', Decimal('0.92'))
+    service = make_service(primary, [secondary], compare_every=1)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.rate == Decimal('0.91')
+    assert result.sources == ['fixerio', 'openexchange']
+
+
+@pytest.mark.asyncio
+async def test_uncompared_miss_skips_secondaries_when_primary_succeeds():
+    primary = make_provider('fixerio', Decimal('0.90'))
+    secondary = make_provider('openexchange', Decimal('0.92'))
+    service = make_service(primary, [secondary], compare_every=0)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.rate == Decimal('0.90')
+    assert result.sources == ['fixerio']
+    secondary.fetch_rate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_compare_every_queries_secondaries_on_one_in_n_fetches():
+    primary = make_provider('fixerio', Decimal('0.90'))
+    secondary = make_provider('openexchange', Decimal('0.92'))
+    service = make_service(primary, [secondary], compare_every=3)
+
+    results = [await service._aggregate_rates('USD', 'EUR') for _ in range(6)]
+
+    assert sum(len(result.sources) == 2 for result in results) == 2
+    assert secondary.fetch_rate.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_uncompared_miss_falls_back_to_secondaries():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    secondary = make_provider('openexchange', Decimal('0.92'))
+    service = make_service(primary, [secondary], compare_every=0)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.rate == Decimal('0.92')
+    assert result.sources == ['openexchange']
+
+
+@pytest.mark.asyncio
+async def test_fallback_takes_first_secondary_and_cancels_the_rest():
+    slow_cancelled = asyncio.Event()
+
+    async def slow_rate(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    slow = make_provider('openexchange')
+    slow.fetch_rate = AsyncMock(side_effect=slow_rate)
+    fast = make_provider('currencyapi', Decimal('0.93'))
+    service = make_service(primary, [slow, fast], compare_every=0)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.sources == ['currencyapi']
+    assert result.rate == Decimal('0.93')
+    assert slow_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_with_secondaries():
+    primary_cancelled = asyncio.Event()
+
+    async def slow_rate(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=slow_rate)
+    secondary = make_provider('openexchange', Decimal('0.92'))
+    service = make_service(primary, [secondary], compare_every=0, hedge_delay=0.01)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.sources == ['openexchange']
+    assert result.rate == Decimal('0.92')
+    assert primary_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_is_dropped_after_timeout():
+    async def hang(*args):
+        await asyncio.sleep(10)
+
+    primary = make_provider('fixerio', Decimal('0.90'))
+    slow = make_provider('openexchange')
+    slow.fetch_rate = AsyncMock(side_effect=hang)
+    service = make_service(primary, [slow], compare_every=1, provider_timeout=0.01)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.sources == ['fixerio']
+    assert result.rate == Decimal('0.90')
+
+
+@pytest.mark.asyncio
+async def test_all_providers_failing_raises_provider_error():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    secondary = make_provider('openexchange', error=ProviderError('down'))
+    service = make_service(primary, [secondary])
+
+    with pytest.raises(ProviderError):
+        await service._aggregate_rates('USD', 'EUR')
+
+
+# ============================================================================
+# TEST: get_rate() - Concurrent cache misses
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_for_same_pair_share_one_fetch():
+    async def slow_rate(*args):
+        await asyncio.sleep(0.01)
+        return Decimal('0.90')
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=slow_rate)
+    service = make_service(primary, [])
+
+    first, second = await asyncio.gather(
+        service.get_rate('USD', 'EUR'), service.get_rate('USD', 'EUR')
+    )
+
+    assert first == second
+    assert primary.fetch_rate.call_count == 1
+    await asyncio.gather(*service.coordinator.background_tasks)
+    service.repository.add_rate_history.assert_called_once()
+    service.repository.cache.set_rate.assert_awaited_once()
+    assert service.coordinator.inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_services_sharing_a_coordinator_share_in_flight_fetch():
+    async def slow_rate(*args):
+        await asyncio.sleep(0.01)
+        return Decimal('0.90')
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=slow_rate)
+    service = make_service(primary, [])
+    other = make_service(primary, [], coordinator=service.coordinator)
+
+    await asyncio.gather(service.get_rate('USD', 'EUR'), other.get_rate('USD', 'EUR'))
+
+    assert primary.fetch_rate.call_count == 1
+    await service.coordinator.drain()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_drain_waits_for_fetch_outliving_its_request():
+    async def slow_rate(*args):
+        await asyncio.sleep(0.01)
+        return Decimal('0.90')
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=slow_rate)
+    service = make_service(primary, [])
+
+    request = asyncio.create_task(service.get_rate('USD', 'EUR'))
+    while not service.coordinator.inflight:
+        await asyncio.sleep(0)
+    request.cancel()
+    await service.coordinator.drain()
+
+    service.repository.add_rate_history.assert_called_once()
+    service.repository.cache.set_rate.assert_awaited_once()
+    assert service.coordinator.inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_without_waiters_is_not_reported_unretrieved():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+    async def failing_rate(*args):
+        await asyncio.sleep(0.01)
+        raise ProviderError('down')
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=failing_rate)
+    service = make_service(primary, [])
+
+    request = asyncio.create_task(service.get_rate('USD', 'EUR'))
+    while not service.coordinator.inflight:
+        await asyncio.sleep(0)
+    fetch = service.coordinator.inflight[('USD', 'EUR')]
+    request.cancel()
+    await asyncio.wait([fetch])
+    await asyncio.sleep(0)
+    del request, fetch
+    gc.collect()
+    loop.set_exception_handler(None)
+
+    assert unhandled == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_miss_waiters_receive_provider_error():
+    async def failing_rate(*args):
+        await asyncio.sleep(0.01)
+        raise ProviderError('down')
+
+    primary = make_provider('fixerio')
+    primary.fetch_rate = AsyncMock(side_effect=failing_rate)
+    service = make_service(primary, [])
+
+    results = await asyncio.gather(
+        service.get_rate('USD', 'EUR'),
+        service.get_rate('USD', 'EUR'),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, ProviderError) for r in results)
+    assert primary.fetch_rate.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_currency_cancels_cache_read():
+    read_cancelled = asyncio.Event()
+
+    async def slow_read(*args):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            read_cancelled.set()
+            raise
+
+    async def reject(*args):
+        await asyncio.sleep(0)
+        raise InvalidCurrencyError('Currency XYZ is not supported')
+
+    service = make_service(make_provider('fixerio', Decimal('0.90')), [])
+    service.repository.cache.get_rate_with_stale = AsyncMock(side_effect=slow_read)
+    service.currency_service.validate_currencies = AsyncMock(side_effect=reject)
+
+    with pytest.raises(InvalidCurrencyError):
+        await service.get_rate('XYZ', 'EUR')
+    await asyncio.sleep(0)
+
+    assert read_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_failed_cache_read_error_is_retrieved_when_validation_rejects():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+    async def reject(*args):
+        await asyncio.sleep(0.01)
+        raise InvalidCurrencyError('Currency XYZ is not supported')
+
+    service = make_service(make_provider('fixerio', Decimal('0.90')), [])
+    service.repository.cache.get_rate_with_stale = AsyncMock(
+        side_effect=ConnectionError('redis down')
+    )
+    service.currency_service.validate_currencies = AsyncMock(side_effect=reject)
+
+    with pytest.raises(InvalidCurrencyError):
+        await service.get_rate('XYZ', 'EUR')
+    await asyncio.sleep(0)
+    gc.collect()
+    loop.set_exception_handler(None)
+
+    assert unhandled == []
+
+
+@pytest.mark.asyncio
+async def test_fresh_local_currencies_skip_async_validation():
+    service = make_service(make_provider('fixerio'), [])
+    fresh = ExchangeRate('USD', 'EUR', Decimal('0.90'), datetime(2025, 11, 5), 'fixerio')
+    service.currency_service.validate_currencies_locally = MagicMock(return_value=True)
+    service.repository.cache.get_rate_with_stale = AsyncMock(return_value=(fresh, None))
+
+    assert await service.get_rate('USD', 'EUR') == fresh
+    service.currency_service.validate_currencies.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_local_rejection_skips_cache_read():
+    service = make_service(make_provider('fixerio'), [])
+    service.currency_service.validate_currencies_locally = MagicMock(
+        side_effect=InvalidCurrencyError('Currency XYZ is not supported')
+    )
+
+    with pytest.raises(InvalidCurrencyError):
+        await service.get_rate('XYZ', 'EUR')
+    service.repository.cache.get_rate_with_stale.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_rate_served_when_all_providers_fail():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    service = make_service(primary, [])
+    stale = ExchangeRate('USD', 'EUR', Decimal('0.89'), datetime(2025, 11, 5), 'fixerio')
+    service.repository.cache.get_rate_with_stale = AsyncMock(return_value=(None, STALE_PAYLOAD))
+
+    assert await service.get_rate('USD', 'EUR') == stale
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_does_not_decode_stale_payload():
+    service = make_service(make_provider('fixerio'), [])
+    fresh = ExchangeRate('USD', 'EUR', Decimal('0.90'), datetime(2025, 11, 5), 'fixerio')
+    service.repository.cache.get_rate_with_stale = AsyncMock(return_value=(fresh, 'not json'))
+
+    assert await service.get_rate('USD', 'EUR') == fresh
+    service.repository.cache.decode_rate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_history_lookup_failure_keeps_provider_error():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    service = make_service(primary, [])
+    service.repository.get_latest_rate = AsyncMock(side_effect=ConnectionError('db down'))
+
+    with pytest.raises(ProviderError):
+        await service.get_rate('USD', 'EUR')
+
+
+@pytest.mark.asyncio
+async def test_unreadable_stale_payload_falls_back_to_history():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    service = make_service(primary, [])
+    latest = ExchangeRate('USD', 'EUR', Decimal('0.88'), datetime(2025, 11, 1), 'averaged')
+    service.repository.cache.get_rate_with_stale = AsyncMock(return_value=(None, 'not json'))
+    service.repository.get_latest_rate = AsyncMock(return_value=latest)
+
+    assert await service.get_rate('USD', 'EUR') == latest
+
+
+@pytest.mark.asyncio
+async def test_structurally_broken_stale_payload_falls_back_to_history():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    service = make_service(primary, [])
+    latest = ExchangeRate('USD', 'EUR', Decimal('0.88'), datetime(2025, 11, 1), 'averaged')
+    broken = '{"from_currency": "USD", "to_currency": "EUR", "rate": "n/a", "source": "fixerio"}'
+    service.repository.cache.get_rate_with_stale = AsyncMock(return_value=(None, broken))
+    service.repository.get_latest_rate = AsyncMock(return_value=latest)
+
+    assert await service.get_rate('USD', 'EUR') == latest
+    service.repository.get_latest_rate.assert_awaited_once_with('USD', 'EUR')
+
+
+@pytest.mark.asyncio
+async def test_latest_history_rate_served_when_stale_key_missing():
+    primary = make_provider('fixerio', error=ProviderError('down'))
+    service = make_service(primary, [])
+    latest = ExchangeRate('USD', 'EUR', Decimal('0.88'), datetime(2025, 11, 1), 'averaged')
+    service.repository.get_latest_rate = AsyncMock(return_value=latest)
+
+    assert await service.get_rate('USD', 'EUR') == latest
+    service.repository.get_latest_rate.assert_awaited_once_with('USD', 'EUR')
+
+
+@pytest.mark.asyncio
+async def test_cache_write_failure_does_not_fail_the_request():
+    primary = make_provider('fixerio', Decimal('0.90'))
+    service = make_service(primary, [])
+    service.repository.cache.set_rate = AsyncMock(side_effect=ConnectionError('redis down'))
+
+    rate = await service.get_rate('USD', 'EUR')
+    await asyncio.gather(*service.coordinator.background_tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert rate.rate == Decimal('0.90')
+    assert service.coordinator.background_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_drain_waits_for_pending_cache_writes():
+    written = asyncio.Event()
+
+    async def slow_write(rate):
+        await asyncio.sleep(0.01)
+        written.set()
+
+    service = make_service(make_provider('fixerio', Decimal('0.90')), [])
+    service.repository.cache.set_rate = AsyncMock(side_effect=slow_write)
+
+    await service.get_rate('USD', 'EUR')
+    await service.coordinator.drain()
+
+    assert written.is_set()
+    assert service.coordinator.background_tasks == set()
+
+
+# ============================================================================
+# TEST: Outlier-robust aggregation
+# ============================================================================
+
+def test_drop_outliers_removes_divergent_rate():
+    rates = {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9260'),
+        'currencyapi': Decimal('1.8500'),
+    }
+
+    assert _drop_outliers(rates) == {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9260'),
+    }
+
+
+def test_drop_outliers_keeps_agreeing_rates():
+    rates = {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9260'),
+        'currencyapi': Decimal('0.9255'),
+    }
+
+    assert _drop_outliers(rates) == rates
+
+
+def test_drop_outliers_keeps_near_match_when_two_rates_tie():
+    rates = {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9250'),
+        'currencyapi': Decimal('0.9251'),
+    }
+
+    assert _drop_outliers(rates) == rates
+
+
+def test_drop_outliers_still_drops_divergent_rate_when_two_rates_tie():
+    rates = {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9250'),
+        'currencyapi': Decimal('1.8500'),
+    }
+
+    assert _drop_outliers(rates) == {
+        'fixerio': Decimal('0.9250'),
+        'openexchange': Decimal('0.9250'),
+    }
+
+
+def test_drop_outliers_needs_three_rates_to_judge():
+    rates = {'fixerio': Decimal('0.9250'), 'openexchange': Decimal('1.8500')}
+
+    assert _drop_outliers(rates) == rates
+
+
+@pytest.mark.asyncio
+async def test_outlier_is_excluded_from_average_but_kept_in_individual_rates():
+    primary = make_provider('fixerio', Decimal('0.90'))
+    agreeing = make_provider('openexchange', Decimal('0.92'))
+    outlier = make_provider('currencyapi', Decimal('9.00'))
+    service = make_service(primary, [agreeing, outlier], compare_every=1)
+
+    result = await service._aggregate_rates('USD', 'EUR')
+
+    assert result.rate == Decimal('0.91')
+    assert result.sources == ['fixerio', 'openexchange']
+    assert result.individual_rates['currencyapi'] == Decimal('9.00')
+
+
+# ============================================================================
+# TEST: get_provider_health()
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_provider_health_checks_run_concurrently_and_are_cached():
+    async def slow_currencies():
+        await asyncio.sleep(0.05)
+        return []
+
+    primary = make_provider('fixerio')
+    primary.fetch_supported_currencies = AsyncMock(side_effect=slow_currencies)
+    secondary = make_provider('openexchange')
+    secondary.fetch_supported_currencies = AsyncMock(side_effect=slow_currencies)
+    service = make_service(primary, [secondary])
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    health = await service.get_provider_health()
+    elapsed = loop.time() - started
+    again = await make_service(
+        primary, [secondary], coordinator=service.coordinator
+    ).get_provider_health()
+
+    assert elapsed < 0.09
+    assert [item['status'] for item in health] == ['operational', 'operational']
+    assert again is health
+    assert primary.fetch_supported_currencies.call_count == 1
+
+@pytest.mark.asyncio
+async def test_provider_health_reports_down_provider():
+    primary = make_provider('fixerio')
+    primary.fetch_supported_currencies = AsyncMock(side_effect=ProviderError('bad key'))
+    secondary = make_provider('openexchange')
+    secondary.fetch_supported_currencies = AsyncMock(return_value=[])
+
+    health = await make_service(primary, [secondary]).get_provider_health()
+
+    assert health == [
+        {'name': 'fixerio', 'status': 'down', 'error': 'bad key'},
+        {'name': 'openexchange', 'status': 'operational', 'error': None},
+    ]
@@ -5,7 +5,7 @@ import pytest
 import json
 from datetime import datetime, timedelta
 from decimal import Decimal
-from unittest.mock import AsyncMock, call
+from unittest.mock import AsyncMock, MagicMock, call
 
 
 from infrastructure.cache.redis_cache import RedisCacheService
@@ -97,6 +97,21 @@ async def test_get_rate_malformed_json_returns_none():
     assert 'Invalid json data' in str(exc_info.value)
 
 
+@pytest.mark.parametrize('payload', [
+    '{"from_currency": "USD", "to_currency": "EUR", "rate": "0.85", "source": "fixerio"}',
+    '{"from_currency": "USD", "to_currency": "EUR", "rate": "abc",'
+    ' "timestamp": "2025-11-05T10:30:00", "source": "fixerio"}',
+    '{"from_currency": "USD", "to_currency": "EUR", "rate": "0.85",'
+    ' "timestamp": "yesterday", "source": "fixerio"}',
+    '{"from_currency": "USD", "to_currency": "EUR", "rate": [0.85],'
+    ' "timestamp": "2025-11-05T10:30:00", "source": "fixerio"}',
+    '[]',
+])
+def test_decode_rate_wraps_malformed_fields_in_cache_error(payload):
+    with pytest.raises(CacheError):
+        RedisCacheService.decode_rate(payload)
+
+
 @pytest.mark.asyncio
 async def test_get_rate_preserves_decimal_precision():
     mock_redis = AsyncMock()
@@ -115,13 +130,53 @@ async def test_get_rate_preserves_decimal_precision():
     assert str(result.rate) == '43521.123456'
 
 
+# ============================================================================
+# TEST: get_rate_with_stale() - Fresh + Stale Read
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_get_rate_with_stale_reads_both_keys_in_one_call():
+    mock_redis = AsyncMock()
+    stale_data = json.dumps({
+        'from_currency': 'USD', 'to_currency': 'EUR', 'rate': '0.84',
+        'timestamp': '2025-11-05T09:00:00', 'source': 'fixerio'
+    })
+    mock_redis.mget.return_value = [None, stale_data]
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+    fresh, stale = await cache_service.get_rate_with_stale('USD', 'EUR')
+
+    assert fresh is None
+    assert stale == stale_data
+    assert cache_service.decode_rate(stale).rate == Decimal('0.84')
+    mock_redis.mget.assert_called_once_with('rate:USD:EUR', 'stale:rate:USD:EUR')
+
+
+@pytest.mark.asyncio
+async def test_get_rate_with_stale_both_missing():
+    mock_redis = AsyncMock()
+    mock_redis.mget.return_value = [None, None]
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+
+    assert await cache_service.get_rate_with_stale('USD', 'EUR') == (None, None)
+
+
 # ============================================================================
 # TEST: set_rate() - Cache Write Scenarios
 # ============================================================================
 
+def make_pipelined_redis():
+    mock_redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return mock_redis, pipe
+
+
 @pytest.mark.asyncio
 async def test_set_rate_serializes_and_stores_with_ttl():
-    mock_redis = AsyncMock()
+    mock_redis, pipe = make_pipelined_redis()
     cache_service = RedisCacheService(redis_client=mock_redis)
 
     # Create rate to cache
@@ -135,15 +190,18 @@ async def test_set_rate_serializes_and_stores_with_ttl():
 
     await cache_service.set_rate(rate)
 
-    mock_redis.setex.assert_called_once()
+    assert pipe.setex.call_count == 2
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    pipe.execute.assert_awaited_once()
 
-    call_args = mock_redis.setex.call_args
-    key = call_args[0][0]
-    ttl = call_args[0][1]
-    stored_data = call_args[0][2]
+    key, ttl, stored_data = pipe.setex.call_args_list[0][0]
+    stale_key, stale_ttl, stale_data = pipe.setex.call_args_list[1][0]
 
     assert key == 'rate:USD:EUR'
     assert ttl == timedelta(minutes=5)
+    assert stale_key == 'stale:rate:USD:EUR'
+    assert stale_ttl == timedelta(hours=24)
+    assert stale_data == stored_data
 
     stored_dict = json.loads(stored_data)
     assert stored_dict['from_currency'] == 'USD'
@@ -155,7 +213,7 @@ async def test_set_rate_serializes_and_stores_with_ttl():
 
 @pytest.mark.asyncio
 async def test_set_rate_handles_high_precision_decimals():
-    mock_redis = AsyncMock()
+    mock_redis, pipe = make_pipelined_redis()
     cache_service = RedisCacheService(redis_client=mock_redis)
 
     rate = ExchangeRate(
@@ -166,8 +224,7 @@ async def test_set_rate_handles_high_precision_decimals():
 
     await cache_service.set_rate(rate)
 
-    call_args = mock_redis.setex.call_args
-    stored_data = call_args[0][2]
+    stored_data = pipe.setex.call_args_list[0][0][2]
     stored_dict = json.loads(stored_data)
 
     assert stored_dict['rate'] == '110.123456789'
@@ -175,7 +232,7 @@ async def test_set_rate_handles_high_precision_decimals():
 
 @pytest.mark.asyncio
 async def test_set_rate_round_trip_consistency():
-    mock_redis = AsyncMock()
+    mock_redis, pipe = make_pipelined_redis()
     cache_service = RedisCacheService(redis_client=mock_redis)
 
     # Original rate
@@ -188,7 +245,7 @@ async def test_set_rate_round_trip_consistency():
 
     await cache_service.set_rate(original_rate)
 
-    stored_json = mock_redis.setex.call_args[0][2]
+    stored_json = pipe.setex.call_args_list[0][0][2]
     mock_redis.get.return_value = stored_json
     retrieved_rate = await cache_service.get_rate('GBP', 'USD')
 
@@ -231,6 +288,71 @@ async def test_get_supported_currencies_cache_miss():
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_get_supported_currencies_served_from_local_copy():
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = json.dumps(['USD', 'EUR'])
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+
+    first = await cache_service.get_supported_currencies()
+    second = await cache_service.get_supported_currencies()
+
+    assert first == second == ['USD', 'EUR']
+    mock_redis.get.assert_called_once_with('currencies:supported')
+
+
+@pytest.mark.asyncio
+async def test_get_supported_currencies_local_copy_expires():
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = json.dumps(['USD', 'EUR'])
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+    cache_service.local_currency_ttl = timedelta(seconds=0)
+
+    await cache_service.get_supported_currencies()
+    await cache_service.get_supported_currencies()
+
+    assert mock_redis.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_supported_currency_codes_reuses_one_set():
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = json.dumps(['USD', 'EUR'])
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+
+    first = await cache_service.get_supported_currency_codes()
+    second = await cache_service.get_supported_currency_codes()
+
+    assert first == frozenset({'USD', 'EUR'})
+    assert second is first
+    mock_redis.get.assert_called_once_with('currencies:supported')
+
+
+@pytest.mark.asyncio
+async def test_get_local_supported_currency_codes_never_reads_redis():
+    mock_redis = AsyncMock()
+    cache_service = RedisCacheService(redis_client=mock_redis)
+
+    assert cache_service.get_local_supported_currency_codes() is None
+    await cache_service.set_supported_currencies(['USD', 'EUR'])
+
+    assert cache_service.get_local_supported_currency_codes() == frozenset({'USD', 'EUR'})
+    mock_redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_supported_currency_codes_cache_miss():
+    mock_redis = AsyncMock()
+    mock_redis.get.return_value = None
+
+    cache_service = RedisCacheService(redis_client=mock_redis)
+
+    assert await cache_service.get_supported_currency_codes() is None
+
+
 @pytest.mark.asyncio
 async def test_set_supported_currencies_stores_with_ttl():
     mock_redis = AsyncMock()
@@ -309,3 +431,4 @@ def test_default_ttl_values():
 
     assert cache_service.rate_ttl == timedelta(minutes=5)
     assert cache_service.currency_ttl == timedelta(hours=24)
+    assert cache_service.local_currency_ttl == timedelta(seconds=60)
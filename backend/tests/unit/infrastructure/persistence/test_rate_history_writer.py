@@ -0,0 +1,136 @@
+# nosec B101
+
+
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+
+from domain.models.currency import ExchangeRate
+from infrastructure.persistence.database import Database
+from infrastructure.persistence.models.currency import RateHistoryDB
+from infrastructure.persistence.rate_history_writer import RateHistoryWriter
+
+
+def make_db():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.get_bind.return_value.dialect.name = 'postgresql'
+
+    db = MagicMock()
+
+    @asynccontextmanager
+    async def managed_session():
+        yield session
+
+    db.managed_session = managed_session
+    return db, session
+
+
+def make_rate(to_currency='EUR'):
+    return ExchangeRate(
+        from_currency='USD',
+        to_currency=to_currency,
+        rate=Decimal('0.85'),
+        timestamp=datetime(2025, 11, 5, 10, 30, 0),
+        source='averaged',
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_rates_are_written_in_one_batch():
+    db, session = make_db()
+    writer = RateHistoryWriter(db, flush_interval=0.01)
+    writer.start()
+
+    writer.enqueue(make_rate('EUR'))
+    writer.enqueue(make_rate('GBP'))
+    await writer.close()
+
+    session.execute.assert_called_once()
+    rows = session.execute.call_args[0][1]
+    assert [row['to_currency'] for row in rows] == ['EUR', 'GBP']
+    assert rows[0]['rate'] == Decimal('0.85')
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_batch_size():
+    db, session = make_db()
+    writer = RateHistoryWriter(db, batch_size=2, flush_interval=0.01)
+    writer.start()
+
+    for code in ['EUR', 'GBP', 'JPY']:
+        writer.enqueue(make_rate(code))
+    await writer.close()
+
+    assert session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_rate_instead_of_blocking():
+    db, session = make_db()
+    writer = RateHistoryWriter(db, max_queue_size=1)
+
+    writer.enqueue(make_rate('EUR'))
+    writer.enqueue(make_rate('GBP'))
+
+    assert writer._queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_write_failure_is_logged_and_queue_still_drains():
+    db, session = make_db()
+    session.execute.side_effect = RuntimeError('db down')
+    writer = RateHistoryWriter(db, flush_interval=0.01)
+    writer.start()
+
+    writer.enqueue(make_rate())
+    await writer.close()
+
+    assert writer._queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_close_gives_up_on_a_hung_database():
+    db, session = make_db()
+
+    async def hang(*args):
+        await asyncio.sleep(10)
+
+    session.execute.side_effect = hang
+    writer = RateHistoryWriter(db, flush_interval=0.01, close_timeout=0.05)
+    writer.start()
+
+    writer.enqueue(make_rate('EUR'))
+    writer.enqueue(make_rate('GBP'))
+    await asyncio.wait_for(writer.close(), timeout=1)
+
+    assert writer._worker is None
+
+
+# ============================================================================
+# TEST: Batched insert against a real database
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_batch_is_inserted_and_duplicate_rows_ignored(tmp_path):
+    db = Database(f'sqlite+aiosqlite:///{tmp_path}/test.db')
+    await db.create_tables()
+    writer = RateHistoryWriter(db, flush_interval=0.01)
+    writer.start()
+
+    writer.enqueue(make_rate('EUR'))
+    writer.enqueue(make_rate('GBP'))
+    writer.enqueue(make_rate('EUR'))
+    await writer.close()
+
+    async with db.managed_session() as session:
+        result = await session.execute(select(RateHistoryDB.to_currency))
+        stored = sorted(result.scalars().all())
+    await db.close()
+
+    assert stored == ['EUR', 'GBP']
@@ -0,0 +1,120 @@
+# nosec B101
+
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import func, select
+
+from domain.models.currency import ExchangeRate, SupportedCurrency
+from infrastructure.persistence.database import Database
+from infrastructure.persistence.models.currency import SupportedCurrencyDB
+from infrastructure.persistence.repositories.currency import CurrencyRepository
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(f'sqlite+aiosqlite:///{tmp_path}/test.db')
+    await database.create_tables()
+    yield database
+    await database.close()
+
+
+def make_cache(currencies=None):
+    cache = MagicMock()
+    cache.get_supported_currencies = AsyncMock(return_value=currencies)
+    cache.set_supported_currencies = AsyncMock()
+    return cache
+
+
+# ============================================================================
+# TEST: has_supported_currencies() - Seeding check
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_has_supported_currencies_false_on_empty_table(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+
+        assert await repo.has_supported_currencies() is False
+
+
+@pytest.mark.asyncio
+async def test_has_supported_currencies_true_once_rows_exist(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        await repo.save_supported_currencies([SupportedCurrency(code='USD', name=None)])
+
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+
+        assert await repo.has_supported_currencies() is True
+
+
+# ============================================================================
+# TEST: save_supported_currencies() - Conflict handling
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_save_supported_currencies_skips_existing_codes(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        await repo.save_supported_currencies([SupportedCurrency(code='USD', name=None)])
+
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        await repo.save_supported_currencies([
+            SupportedCurrency(code='USD', name=None),
+            SupportedCurrency(code='EUR', name=None),
+        ])
+
+    async with db.managed_session() as session:
+        count = await session.scalar(select(func.count()).select_from(SupportedCurrencyDB))
+
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_save_supported_currencies_empty_list_is_noop(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        await repo.save_supported_currencies([])
+
+        assert await repo.has_supported_currencies() is False
+
+
+# ============================================================================
+# TEST: get_latest_rate() - History fallback
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_get_latest_rate_returns_newest_row_for_pair(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        repo.add_rate_history(
+            ExchangeRate('USD', 'EUR', Decimal('0.88'), datetime(2025, 11, 1), 'fixerio')
+        )
+        repo.add_rate_history(
+            ExchangeRate('USD', 'EUR', Decimal('0.89'), datetime(2025, 11, 5), 'averaged')
+        )
+        repo.add_rate_history(
+            ExchangeRate('USD', 'GBP', Decimal('0.77'), datetime(2025, 11, 9), 'fixerio')
+        )
+
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+        latest = await repo.get_latest_rate('USD', 'EUR')
+
+    assert latest.rate == Decimal('0.89')
+    assert latest.timestamp == datetime(2025, 11, 5)
+    assert latest.source == 'averaged'
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rate_none_without_history(db):
+    async with db.managed_session() as session:
+        repo = CurrencyRepository(db_session=session, cache_service=make_cache())
+
+        assert await repo.get_latest_rate('USD', 'EUR') is None